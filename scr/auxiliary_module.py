@@ -1,6 +1,9 @@
 import pandas as pd
-import traceback
-import time
+import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import os
+import re
 import logging
 logging.basicConfig(level=logging.WARNING)
 
@@ -9,7 +12,7 @@ class AuxiliaryVar:
 
     def __init__(self):
     
-        self.date_time_formats =    [
+        self.date_time_formats =    tuple(dict.fromkeys([
             "%m/%d/",               # mm/dd
             "%d/%m/",               # dd/mm
             "%m-%d",                # mm-dd
@@ -38,11 +41,38 @@ class AuxiliaryVar:
             "%I:%M:%S %p",          # 12-hour time with AM/PM
             "%Y-%d.%m. %H:%M",      # PVSOL + year
             "%Y-%m-%d %H:%M:%S%z"   # Pandas DateTime ISO 8601 format with timezone
-            ]
+            ]))
+
+        # Candidate formats grouped by the separators found in their output
+        self.format_index:dict[tuple[bool, bool, bool], list[str]] = {}
+        for dt_format in self.date_time_formats:
+            literal = re.sub(r"%.", "", dt_format.strip())
+            keys    = {self.separator_key(literal)}
+            # Negative UTC offsets add a dash to the output
+            if "%z" in dt_format:
+                keys.add(self.separator_key(literal + "-"))
+            for key in keys:
+                self.format_index.setdefault(key, []).append(dt_format)
+
+    @staticmethod
+    def separator_key(text:str) -> tuple[bool, bool, bool]:
+        """
+        Describes which of the separators "/", "-" and " " a date-time 
+        string or format contains.
+
+        Args:
+            text (str): Date-time string or format literal
+
+        Returns:
+            tuple[bool, bool, bool]: Presence of slash, dash and space
+        """
+        return ("/" in text, "-" in text, " " in text)
 
 class AuxiliaryFunc:
     def __init__(self):
         self.auxiliary_var  = AuxiliaryVar()
+        # Parsed profiles keyed by (absolute path, modification time)
+        self._csv_cache:dict[tuple[str, int], pd.DataFrame] = {}
     
     def resample_quarter_to_hour(self, dataframe:pd.DataFrame) -> pd.DataFrame:
         """
@@ -56,7 +86,17 @@ class AuxiliaryFunc:
             pd.DataFrame: DataFrame indexed by hourly timestamps.
         """
         try:
-            if pd.infer_freq(dataframe.index) == '15min':
+            index   = dataframe.index
+            # Compare the first and last step instead of inferring frequency
+            quarter_hourly  = (
+                len(index) > 1 
+                and index[1] - index[0] == pd.Timedelta(minutes=15)
+                and index[-1] - index[-2] == pd.Timedelta(minutes=15)
+                )
+            if logging.getLogger().isEnabledFor(logging.DEBUG) and len(index) > 2:
+                if quarter_hourly != (pd.infer_freq(index) == '15min'):
+                    logging.debug("[resample_quarter_to_hour] Step check disagrees with inferred frequency")
+            if quarter_hourly:
                 dataframe = dataframe.resample('1h').mean()
                 logging.info("[resample_quarter_to_hour] Quarter hourly data resampled to hourly")
                 return dataframe
@@ -64,9 +104,8 @@ class AuxiliaryFunc:
                 logging.info("[resample_quarter_to_hour] No data in need of resampling detected")
                 return dataframe
         except Exception as e:
-            logging.error(f"[resample_quarter_to_hour]: {e}")
-            logging.error("[resample_quarter_to_hour] Stack trace: \n%s", traceback.print_exc())
-            return pd.DataFrame
+            logging.exception(f"[resample_quarter_to_hour]: {e}")
+            return pd.DataFrame()
 
     def remove_feb_29_if_mismatch(self, df1: pd.DataFrame, df2: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -84,9 +123,12 @@ class AuxiliaryFunc:
         try:
             len1, len2 = len(df1), len(df2)
 
-            # Define helper to remove Feb 29
+            # Define helper to remove Feb 29 (day 60 of a leap year)
             def remove_feb_29(df: pd.DataFrame) -> pd.DataFrame:
-                return df[~((df.index.month == 2) & (df.index.day == 29))]
+                leap_year = df.index.is_leap_year
+                if not leap_year.any():
+                    return df
+                return df.iloc[np.flatnonzero((df.index.dayofyear != 60) | ~leap_year)]
 
             # Only remove Feb 29 from one of the DataFrames if lengths mismatch
             if len1 == 8784 and len2 == 8760:
@@ -97,15 +139,43 @@ class AuxiliaryFunc:
                 logging.warning(f"[remove_feb_29_if_mismatch] Length mismatch but unexpected row counts: df1={len1}, df2={len2}")
             return df1, df2
         except Exception as e:
-            logging.error(f"[remove_feb_29_if_mismatch]: {e}")
-            logging.error("[remove_feb_29_if_mismatch] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[remove_feb_29_if_mismatch]: {e}")
             return df1, df2
     
+    def arrow_csv_to_dataframe(self, path:str) -> pd.DataFrame | None:
+        """
+        Reads a headerless profile CSV with the Arrow CSV reader. The first 
+        column is kept as text so that a single date-time format can be 
+        detected for the whole column, Arrow would try its timestamp 
+        parsers on each value separately and could mix dd/mm and mm/dd.
+
+        Args:
+            path (str): Path to CSV file to read
+
+        Returns:
+            pd.DataFrame | None: DataFrame with integer column labels, or 
+            None if the Arrow reader could not read the file
+        """
+        try:
+            table = pacsv.read_csv(
+                path,
+                read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={'f0': pa.string()})
+                )
+        except Exception as e:
+            logging.info(f"[arrow_csv_to_dataframe] Falling back to pandas: {e}")
+            return None
+        dataframe           = table.to_pandas()
+        dataframe.columns   = range(len(dataframe.columns))
+        return dataframe
+
     def profile_csv_to_dataframe(self, path:str) -> pd.DataFrame:
         """
         Converts a CSV file to dataframe. Checks if format of first column
         corresponds to a known date-time format. Converts to datetime index
-        according to detected format.
+        according to detected format. Parsed files are cached until the 
+        file on disk is modified.
 
         Args:
             path (str): Path to CSV file to convert dataframe
@@ -116,22 +186,50 @@ class AuxiliaryFunc:
 
         """
         try:
-            dataframe   = pd.read_csv(path, header=None)
+            key         = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+            if key in self._csv_cache:
+                return self._csv_cache[key].copy(deep=False)
+            dataframe   = self.arrow_csv_to_dataframe(path)
+            if dataframe is None:
+                # Known schema, skip dtype inference in the C parser
+                dataframe   = pd.read_csv(
+                    path, 
+                    header=None, 
+                    engine='c', 
+                    dtype={0: str, 1: 'float64'})
         except FileNotFoundError:
             logging.error(f"[profile_csv_to_dataframe]: {path}")
-            return pd.DataFrame
+            return pd.DataFrame()
         matched_format = None
         try:
-            for sample in dataframe[0].dropna().astype(str).head(20):
-                for dt_format in self.auxiliary_var.date_time_formats:
+            # Let the C parser take the whole column if it is ISO 8601, 
+            # it fails on the first row otherwise. format='mixed' is not 
+            # tried, dateutil would date year-less rows to the current year
+            try:
+                dataframe[0]    = pd.to_datetime(
+                    dataframe[0], 
+                    format='ISO8601', 
+                    utc=True)
+                dataframe.set_index(0, inplace=True)
+            except ValueError:
+                # Try each known format on a sample of the first column at once
+                samples = dataframe[0].dropna().astype(str).str.strip().head(20).to_numpy()
+                # Only probe formats with the same separators as the data
+                candidates = self.auxiliary_var.format_index.get(
+                    self.auxiliary_var.separator_key(samples[0]) if len(samples) else None, 
+                    [])
+                for dt_format in candidates:
                     try:
-                       time.strptime(sample.strip(), dt_format)
-                       matched_format   = dt_format
-                       break
+                        parsed = pd.to_datetime(
+                            samples, 
+                            format=dt_format, 
+                            errors='coerce', 
+                            utc=True)
                     except ValueError:
                         continue
-                if matched_format:
-                    break
+                    if not parsed.isna().any():
+                        matched_format   = dt_format
+                        break
             if matched_format:
                 if "Y" in  matched_format or "y" in matched_format:
                     dataframe[0]       = pd.to_datetime(
@@ -139,16 +237,28 @@ class AuxiliaryFunc:
                         format=matched_format, 
                         utc=True)
                 else:
-                    dataframe[0]    = pd.to_datetime(
-                                '2024-' + dataframe[0],
-                                format=f'%Y-{matched_format}', 
-                                utc=True
-                                )
+                    # Parse without year, then shift pandas' default 1900 to 2024
+                    parsed  = pd.to_datetime(
+                        dataframe[0], 
+                        format=matched_format, 
+                        errors='coerce', 
+                        utc=True)
+                    if parsed.isna().sum() == dataframe[0].isna().sum():
+                        dataframe[0]    = parsed + pd.DateOffset(years=2024 - 1900)
+                    else:
+                        # Feb 29 does not exist in 1900, parse with the year instead
+                        dataframe[0]    = pd.to_datetime(
+                                    '2024-' + dataframe[0],
+                                    format=f'%Y-{matched_format}', 
+                                    utc=True
+                                    )
                 dataframe.set_index(0, inplace=True)
             dataframe   = self.resample_quarter_to_hour(dataframe)
+            # Mark parsed UTC index so callers can skip re-converting it
+            dataframe.attrs['datetime_index'] = isinstance(dataframe.index, pd.DatetimeIndex)
+            self._csv_cache[key] = dataframe
             logging.info("Profile CSV successfully converted to dataframe")
-            return dataframe
+            return dataframe.copy(deep=False)
         except Exception as e:
-            logging.error(f"[profile_csv_to_dataframe]: {e}")
-            logging.error("[profile_csv_to_dataframe] Stack trace: \n%s", traceback.print_exc())
-            return pd.DataFrame
\ No newline at end of file
+            logging.exception(f"[profile_csv_to_dataframe]: {e}")
+            return pd.DataFrame()
\ No newline at end of file
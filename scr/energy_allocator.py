@@ -3,12 +3,63 @@ TODO: Implement SMA and SMB compensation models.
 """
 
 import pandas as pd
-import traceback
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from auxiliary_module import AuxiliaryVar, AuxiliaryFunc
 from spot_module import SpotMedianCalculator
 import logging
 logging.basicConfig(level=logging.WARNING)
 
+
+# ALLOCATION KERNELS ---------------------------------------------------------
+def _company_balance(
+        production      :np.ndarray,
+        consumption     :np.ndarray,
+        price_fees      :np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Elementwise energy balance of the housing company over float64 arrays.
+
+    Args:
+        production (np.ndarray): Hourly PV production [kWh].
+        consumption (np.ndarray): Hourly company consumption [kWh].
+        price_fees (np.ndarray): Hourly spot median with fees [c/kWh].
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Company consumption after 
+        PV [kWh], value of coverage [c] and PV left after company [kWh].
+    """
+    company_after_pv    = np.maximum(consumption - production, 0.0)
+    company_value       = price_fees * (consumption - company_after_pv)
+    pv_after_company    = np.maximum(production - consumption, 0.0)
+    return company_after_pv, company_value, pv_after_company
+
+def _apartment_balance(
+        pv_after_company    :np.ndarray,
+        price_fees          :np.ndarray,
+        consumption         :np.ndarray,
+        allocation          :np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Energy balance of every apartment over an hours x apartments matrix.
+
+    Args:
+        pv_after_company (np.ndarray): Hourly PV left after company [kWh].
+        price_fees (np.ndarray): Hourly spot median with fees [c/kWh].
+        consumption (np.ndarray): Apartment consumption, one column per 
+            apartment [kWh].
+        allocation (np.ndarray): Share of leftover PV for each apartment.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Apartment consumption after PV [kWh] 
+        and value of coverage [c], shaped like `consumption`.
+    """
+    allocated   = pv_after_company[:, None] * allocation[None, :]
+    after_pv    = consumption - allocated
+    value       = price_fees[:, None] * (consumption - after_pv)
+    return after_pv, value
+
+
 class EnergyAllocator:
     """
     Performs energy allocation analysis for a housing company using photovoltaic (PV) production data.
@@ -30,7 +81,7 @@ class EnergyAllocator:
         vat_perc (float): VAT percentage (as a decimal) to include in value calculations.
         transfer_fee_perc (float): Transfer fee per kWh to include in value calculations.
         spot_cache_rel_dir (str): Directory where spot price statistics are cached.
-        spot_cache_file (str): Filename of cached spot price data.
+        spot_cache_file (str): Name of the cached spot price dataset directory.
     """
 
 # CLASS CONSTANTS ------------------------------------------------------------
@@ -44,7 +95,7 @@ class EnergyAllocator:
             vat_perc                :float              = 0.255,
             transfer_fee_perc       :float              = 0.111,
             spot_cache_rel_dir      :str                = "assets",
-            spot_cache_file         :str                = "spot_price_data.csv",
+            spot_cache_file         :str                = "spot_price_data",
 
     ):
         # Analysis length limit
@@ -81,6 +132,25 @@ class EnergyAllocator:
         self.pv_over_production             = "PV over production [kWh]"
         self.value_to_grid                  = "Electricity value to grid [c]"
 
+        # Stage results, computed once per instance and reused downstream
+        self._stage_production              = None
+        self._stage_company_consumption     = None
+        self._final_df                      = None
+
+        # Column arrays of the calculation stages on one shared index
+        self._index:pd.DatetimeIndex        = None
+        self._arrays:dict[str, np.ndarray]  = {}
+        self._apt_matrix:np.ndarray         = None
+        self._apt_names:dict[str, dict[str, str]] = {}
+
+        # Columns summed by sma_value_sum and energy_value_sum, apartment 
+        # columns are added in between once apartments are calculated
+        self._value_columns:list[str]       = [self.value_after_subtraction, self.value_to_grid]
+        self._consumption_columns:list[str] = [self.company_column]
+        self._after_columns:list[str]       = [self.company_after_pv]
+        # Columns present at the end of each built stage, in order
+        self._stage_columns:dict[str, list[str]] = {}
+
 # PROFILE PROCESSING FUNCTIONS -----------------------------------------------
     def add_production(self) -> pd.DataFrame:
         """
@@ -98,11 +168,13 @@ class EnergyAllocator:
 
 
         try:
+            if self._stage_production is not None:
+                return self._stage_production.copy(deep=False)
             self.production_df  = self.auxiliary_func.profile_csv_to_dataframe(self.production_path)
             self.production_df.columns = [self.production_column]
             dataframe = self.spot_processor.spot_remove_years()
-            # Ensure datetime index for both dataframes
-            if not isinstance(self.production_df.index, pd.DatetimeIndex):
+            # Ensure datetime index unless already parsed from the CSV
+            if not self.production_df.attrs.get('datetime_index'):
                 self.production_df.index   = pd.to_datetime(
                     self.production_df.index, utc=True)
             # Drop Feb 29 if one dataframe has 8760 hourse (leap year mismatch)
@@ -111,7 +183,8 @@ class EnergyAllocator:
             if self.production_column not in self.production_df.columns:
                 raise KeyError(f"Column {self.production_column} not found in production data.")
             # Align PV production index to match dataframe
-            self.production_df = self.production_df.reindex(dataframe.index)
+            if not self.production_df.index.equals(dataframe.index):
+                self.production_df = self.production_df.reindex(dataframe.index, copy=False)
             # Check for NaN values in value or index columns respectively
             if self.production_df[self.production_column].isna().any():
                 logging.warning("[add_production]: NaN values after reindexing production data.")
@@ -119,10 +192,10 @@ class EnergyAllocator:
                 logging.warning("[add_production] Warning: Production index partially mismatched with price index.")
             # Assign aligned PV production to new column
             dataframe[self.production_column] = self.production_df[self.production_column]
-            return dataframe
+            self._stage_production = dataframe
+            return dataframe.copy(deep=False)
         except Exception as e:
-            logging.error(f"[add_production] Error : {e}")
-            logging.error("[add_production] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[add_production]: {e}")
             return pd.DataFrame()
 
     def add_company_consumption(self) -> pd.DataFrame:
@@ -140,12 +213,14 @@ class EnergyAllocator:
 
 
         try:
+            if self._stage_company_consumption is not None:
+                return self._stage_company_consumption.copy(deep=False)
             company_df  = self.auxiliary_func.profile_csv_to_dataframe(self.company_path)
             company_df.columns = [self.company_column]
             # Determine function to use as basis for dataframe
             dataframe = self.add_production()
-            # Ensure datetime index for both dataframes
-            if not isinstance(company_df.index, pd.DatetimeIndex):
+            # Ensure datetime index unless already parsed from the CSV
+            if not company_df.attrs.get('datetime_index'):
                 company_df.index = pd.to_datetime(company_df.index, utc=True)
             # Drop Feb 29 if one dataframe has 8760 hourse (leap year mismatch)
             company_df, dataframe = self.auxiliary_func.remove_feb_29_if_mismatch(company_df, dataframe)
@@ -153,7 +228,8 @@ class EnergyAllocator:
             if self.company_column not in company_df.columns:
                 raise KeyError(f"Column {self.company_column} not found in production data.")
             # Align company_df consumption index to match dataframe
-            company_df = company_df.reindex(dataframe.index)
+            if not company_df.index.equals(dataframe.index):
+                company_df = company_df.reindex(dataframe.index, copy=False)
             # Check for NaN values in value or index columns respectively
             if company_df[self.company_column].isna().any():
                 logging.warning("[add_company_consumption]: NaN values after reindexing company_df consumption data.")
@@ -161,10 +237,10 @@ class EnergyAllocator:
                 logging.warning("[add_production] Consumption index partially mismatched with price index.")
             # Assign aligned company_df consumption to new column
             dataframe[self.company_column] = company_df[self.company_column]
-            return dataframe
+            self._stage_company_consumption = dataframe
+            return dataframe.copy(deep=False)
         except Exception as e:
-            logging.error(f"[add_company_consumption]: {e}")
-            logging.error("[add_company_consumption] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[add_company_consumption]: {e}")
             return pd.DataFrame()
             
     def calculate_company(self) -> pd.DataFrame:
@@ -182,28 +258,10 @@ class EnergyAllocator:
 
 
         try:
-            dataframe               = self.add_company_consumption()
-            # Safety check
-            required_columns = [
-                self.company_column, self.production_column, self.spot_price_median
-            ]
-            for col in required_columns:
-                if col not in dataframe.columns:
-                    raise KeyError(f"Column {col} missing from dataframe.")
-            # Energy coverage calculation
-            unmet_consumption = dataframe[self.company_column] - dataframe[self.production_column]
-            dataframe[self.company_after_pv] = unmet_consumption.clip(lower=0)
-            # Financial value calculation
-            covered_consumption = dataframe[self.company_column] - dataframe[self.company_after_pv]
-            value = (dataframe[self.spot_price_median_fees]) * covered_consumption
-            dataframe[self.value_after_subtraction]  = value
-            # Production leftover calculation
-            excess_pv = dataframe[self.production_column] - dataframe[self.company_column]
-            dataframe[self.pv_after_company] = excess_pv.clip(lower=0)
-            return dataframe
+            self._build_company()
+            return self._materialize("company")
         except Exception as e:
-            logging.error(f"[calculate_company]: {e}")
-            logging.error("[calculate_company] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[calculate_company]: {e}")
             return pd.DataFrame()
     
     def add_apartment_consumption(self) -> pd.DataFrame:
@@ -221,38 +279,10 @@ class EnergyAllocator:
         """
 
         try:
-            dataframe   = self.calculate_company()
-            self.profile_df = pd.DataFrame()
-            # Method to take when calculating energy by apartment
-            if self.calculation_method == "by_apartment":
-                self.apartments_df  = pd.DataFrame(self.app_data_dict).set_index("apartment")
-            # Method to take when calculating energy by apartment type
-            elif self.calculation_method == "by_type":
-                self.apartments_df  = pd.DataFrame(self.app_data_dict).set_index("apartment")
-                dataframe   = self.calculate_company()
-                # Repeat each row by row in "amount" column
-                self.apartments_df = self.apartments_df.loc[self.apartments_df.index.repeat(self.apartments_df["amount"])].copy()
-                # Store the apartment group letter in a new column
-                self.apartments_df["apartment_letter"] = self.apartments_df.index
-                # Create a global counter starting from 1
-                global_index = range(1, len(self.apartments_df) + 1)
-                # Set new index like A1, A2, ..., C11
-                self.apartments_df.index = [f"{apt}{i}" for apt, i in zip(self.apartments_df["apartment_letter"], global_index)]
-                # Drop helper column
-                self.apartments_df.drop(columns="apartment_letter", inplace=True)
-                # Normalize allocation across duplicated rows
-                self.apartments_df["allocation"] = self.apartments_df["allocation"] / self.apartments_df["amount"]
-            for apartment in self.apartments_df.index:
-                self.apartment_consumption  = self.temp_apartment_consumption.replace("APP", apartment)
-                path    = self.apartments_df.loc[apartment, "profile"]
-                self.profile_df[self.apartment_consumption]   = self.auxiliary_func.profile_csv_to_dataframe(path)
-                self.auxiliary_func.remove_feb_29_if_mismatch(dataframe, self.profile_df)
-                self.apartment_consumption  = self.temp_apartment_consumption.replace("APP", apartment)
-                dataframe[self.apartment_consumption] = self.profile_df[self.apartment_consumption]
-            return dataframe           
+            self._build_apartment_consumption()
+            return self._materialize("apartment_consumption")
         except Exception as e:
-            logging.error(f"[add_apartment_consumption]: {e}")
-            logging.error("[add_apartment_consumption] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[add_apartment_consumption]: {e}")
             return pd.DataFrame()
 
     def calculate_apartment(self) -> pd.DataFrame:
@@ -269,25 +299,10 @@ class EnergyAllocator:
 
 
         try:
-            dataframe   = self.add_apartment_consumption()
-            for apartment in self.apartments_df.index:
-                apartment_column = f"{apartment} consumption [kWh]"
-                if apartment_column not in dataframe.columns:
-                    raise KeyError(f"Expected column {apartment_column} not found.")
-                self.app_after_pv       = self.temp_app_after_pv.replace("APP", apartment)
-                self.value_of_coverage  = self.temp_value_of_coverage.replace("APP", apartment)
-
-                app_after_pv    =   dataframe[apartment_column] - (dataframe[self.pv_after_company]*self.apartments_df.loc[apartment, "allocation"])
-                covered_consumption = dataframe[apartment_column] - app_after_pv
-                allocation_value = (dataframe[self.spot_price_median_fees]) * covered_consumption
-                insert_loc = dataframe.columns.get_loc(apartment_column) + 1
-
-                dataframe.insert(insert_loc, self.app_after_pv, app_after_pv)
-                dataframe.insert(insert_loc + 1, self.value_of_coverage, allocation_value)
-            return dataframe
+            self._build_apartment()
+            return self._materialize("apartment")
         except Exception as e:
-            logging.error(f"[calculate_apartment]: {e}")
-            logging.error("[calculate_apartment] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[calculate_apartment]: {e}")
             return pd.DataFrame()
 
     def calculate_pv_over_production(self) -> pd.DataFrame:
@@ -305,20 +320,176 @@ class EnergyAllocator:
 
 
         try:
-            dataframe   = self.calculate_apartment()
-            # Calculate energy left after consumption coverage with < 0 = 0
-            calculation = (dataframe[self.production_column] 
-                           - (dataframe[self.company_column] 
-                              + self.profile_df.sum(axis=1))).clip(lower=0)
-            dataframe[self.pv_over_production] = calculation
-            value   = dataframe[self.pv_over_production] * dataframe[self.spot_price_median]
-            dataframe[self.value_to_grid]   = value
-            return dataframe.round(3)
+            if self._final_df is None:
+                self._build_pv_over_production()
+                self._final_df  = self._materialize("pv_over_production").round(3)
+            return self._final_df.copy(deep=False)
         except Exception as e:
-            logging.error(f"[calculate_pv_over_production]: {e}")
-            traceback.print_exc()
+            logging.exception(f"[calculate_pv_over_production]: {e}")
             return pd.DataFrame()
-        
+
+# ARRAY STAGES ---------------------------------------------------------------
+    def _materialize(self, stage:str) -> pd.DataFrame:
+        """
+        Wraps the column arrays of a calculation stage into a DataFrame on 
+        the shared index.
+
+        Args:
+            stage (str): Name of a built stage in `self._stage_columns`.
+
+        Returns:
+            pd.DataFrame: The columns present when the stage was built, in the 
+            order they were calculated, regardless of later stages.
+        """
+        return pd.DataFrame(
+            {column: self._arrays[column] for column in self._stage_columns[stage]}, 
+            index=self._index)
+
+    def _build_company(self) -> None:
+        """
+        Loads the aligned production, price and company consumption data as 
+        arrays and calculates the company energy balance on them.
+        """
+        if "company" in self._stage_columns:
+            return
+        dataframe               = self.add_company_consumption()
+        # Safety check
+        required_columns = [
+            self.company_column, self.production_column, self.spot_price_median
+        ]
+        for col in required_columns:
+            if col not in dataframe.columns:
+                raise KeyError(f"Column {col} missing from dataframe.")
+        self._index     = dataframe.index
+        self._arrays    = {
+            column: dataframe[column].to_numpy(dtype=np.float64) 
+            for column in dataframe.columns
+            }
+        # Energy coverage, financial value and production leftover
+        company_after_pv, company_value, pv_after_company = _company_balance(
+            self._arrays[self.production_column],
+            self._arrays[self.company_column],
+            self._arrays[self.spot_price_median_fees],
+            )
+        self._arrays[self.company_after_pv]         = company_after_pv
+        self._arrays[self.value_after_subtraction]  = company_value
+        self._arrays[self.pv_after_company]         = pv_after_company
+        self._stage_columns["company"] = list(self._arrays)
+
+    def _build_apartment_consumption(self) -> None:
+        """
+        Reads apartment consumption profiles and stores them as arrays 
+        aligned to the shared index.
+        """
+        if "apartment_consumption" in self._stage_columns:
+            return
+        self._build_company()
+        self.profile_df = pd.DataFrame()
+        # Method to take when calculating energy by apartment
+        if self.calculation_method == "by_apartment":
+            self.apartments_df  = pd.DataFrame(self.app_data_dict).set_index("apartment")
+        # Method to take when calculating energy by apartment type
+        elif self.calculation_method == "by_type":
+            self.apartments_df  = pd.DataFrame(self.app_data_dict).set_index("apartment")
+            # Repeat each row by row in "amount" column
+            self.apartments_df = self.apartments_df.loc[self.apartments_df.index.repeat(self.apartments_df["amount"])].copy()
+            # Store the apartment group letter in a new column
+            self.apartments_df["apartment_letter"] = self.apartments_df.index
+            # Create a global counter starting from 1
+            global_index = range(1, len(self.apartments_df) + 1)
+            # Set new index like A1, A2, ..., C11
+            self.apartments_df.index = [f"{apt}{i}" for apt, i in zip(self.apartments_df["apartment_letter"], global_index)]
+            # Drop helper column
+            self.apartments_df.drop(columns="apartment_letter", inplace=True)
+            # Normalize allocation across duplicated rows
+            self.apartments_df["allocation"] = self.apartments_df["allocation"] / self.apartments_df["amount"]
+        # Column names of each apartment, resolved once from the templates
+        self._apt_names = {
+            apartment: {
+                "cons":     self.temp_apartment_consumption.replace("APP", apartment),
+                "after":    self.temp_app_after_pv.replace("APP", apartment),
+                "value":    self.temp_value_of_coverage.replace("APP", apartment),
+                }
+            for apartment in self.apartments_df.index
+            }
+        # Read each distinct profile once, overlapping file I/O and parsing
+        paths   = list(dict.fromkeys(self.apartments_df["profile"]))
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(paths)))) as executor:
+            loaded  = dict(zip(paths, executor.map(self.auxiliary_func.profile_csv_to_dataframe, paths)))
+        for apartment in self.apartments_df.index:
+            self.apartment_consumption  = self._apt_names[apartment]["cons"]
+            path    = self.apartments_df.loc[apartment, "profile"]
+            self.profile_df[self.apartment_consumption]   = loaded[path]
+        # Align all profiles to the shared index at once
+        profiles = self.profile_df
+        if not profiles.index.equals(self._index):
+            profiles = profiles.reindex(self._index, copy=False)
+        # Hours x apartments matrix, each apartment array is a column view
+        self._apt_matrix = profiles.to_numpy(dtype=np.float64)
+        for position, column in enumerate(profiles.columns):
+            self._arrays[column] = self._apt_matrix[:, position]
+        self._stage_columns["apartment_consumption"] = list(self._arrays)
+
+    def _build_apartment(self) -> None:
+        """
+        Calculates the energy balance of every apartment and places the 
+        results after each apartment's consumption array.
+        """
+        if "apartment" in self._stage_columns:
+            return
+        self._build_apartment_consumption()
+        following_columns   = {}
+        for apartment in self.apartments_df.index:
+            apartment_column = self._apt_names[apartment]["cons"]
+            if apartment_column not in self._arrays:
+                raise KeyError(f"Expected column {apartment_column} not found.")
+        after_pv, value = _apartment_balance(
+            self._arrays[self.pv_after_company],
+            self._arrays[self.spot_price_median_fees],
+            self._apt_matrix,
+            self.apartments_df["allocation"].to_numpy(dtype=np.float64),
+            )
+        for position, apartment in enumerate(self.apartments_df.index):
+            names                   = self._apt_names[apartment]
+            self.app_after_pv       = names["after"]
+            self.value_of_coverage  = names["value"]
+            self._value_columns.insert(-1, self.value_of_coverage)
+            self._consumption_columns.append(names["cons"])
+            self._after_columns.append(self.app_after_pv)
+            following_columns[names["cons"]] = {
+                self.app_after_pv:      after_pv[:, position],
+                self.value_of_coverage: value[:, position],
+                }
+        # Place results right after each apartment's consumption array
+        arrays = {}
+        for column, array in self._arrays.items():
+            arrays[column] = array
+            arrays.update(following_columns.get(column, {}))
+        self._arrays = arrays
+        self._stage_columns["apartment"] = list(self._arrays)
+
+    def _build_pv_over_production(self) -> None:
+        """
+        Calculates PV surplus after company and apartments, and its value 
+        when sold to the grid.
+        """
+        if "pv_over_production" in self._stage_columns:
+            return
+        self._build_apartment()
+        # Calculate energy left after consumption coverage with < 0 = 0
+        # Skip missing values like DataFrame.sum, an hour in the profiles sums 
+        # to 0 even if every apartment value is missing
+        apartment_total = np.nansum(self._apt_matrix, axis=1)
+        # Hours absent from the profiles before alignment have no total
+        if not self.profile_df.index.equals(self._index):
+            apartment_total[~self._index.isin(self.profile_df.index)] = np.nan
+        calculation = np.maximum(self._arrays[self.production_column] 
+                                 - (self._arrays[self.company_column] 
+                                    + apartment_total), 0.0)
+        self._arrays[self.pv_over_production]   = calculation
+        self._arrays[self.value_to_grid]        = calculation * self._arrays[self.spot_price_median]
+        self._stage_columns["pv_over_production"] = list(self._arrays)
+
     def sma_value_sum(self) -> pd.Series:  
         """
         Calculates total monetary value (in cents) from PV energy use.
@@ -335,11 +506,10 @@ class EnergyAllocator:
 
         try:
             dataframe = self.calculate_pv_over_production()
-            value_columns        = [col for col in dataframe.columns if "value" in col.lower()]
-            return dataframe[value_columns].sum().round(0)
+            totals  = np.nansum(dataframe[self._value_columns].to_numpy(dtype=np.float64), axis=0)
+            return pd.Series(totals, index=self._value_columns).round(0)
         except Exception as e:
-            logging.error(f"[financial_value_sum]: {e}")
-            logging.error("[financial_value_sum] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[financial_value_sum]: {e}")
             return pd.DataFrame()
         
     def energy_value_sum(self) -> pd.Series:  
@@ -357,16 +527,17 @@ class EnergyAllocator:
 
         try:
             dataframe = self.calculate_pv_over_production()
-            before_columns = [col for col in dataframe.columns if "consumption" in col.lower()]
-            after_columns = [col for col in dataframe.columns if "after" in col.lower()]
+            before_columns = self._consumption_columns
+            after_columns = self._after_columns
             if len(before_columns) != len(after_columns):
                 raise ValueError("Mismatched number of 'before' and 'after' columns")
             # Compute differences for each pair
-            savings = {}
-            for before, after in zip(before_columns, after_columns):
-                savings[before.replace("consumption", "consumption covered")] = (dataframe[before] - dataframe[after]).sum()
-            return pd.Series(savings)
+            covered = (dataframe[before_columns].to_numpy(dtype=np.float64) 
+                       - dataframe[after_columns].to_numpy(dtype=np.float64))
+            savings = pd.Series(
+                np.nansum(covered, axis=0), 
+                index=[before.replace("consumption", "consumption covered") for before in before_columns])
+            return savings
         except Exception as e:
-            logging.error(f"[energy_value_sum]: {e}")
-            logging.error("[energy_value_sum] Stack trace: \n%s", traceback.print_exc())
+            logging.exception(f"[energy_value_sum]: {e}")
             return pd.DataFrame()
\ No newline at end of file
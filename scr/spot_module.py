@@ -4,13 +4,59 @@ hours, not just years
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import traceback
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as pa_dataset
 from auxiliary_module import AuxiliaryVar, AuxiliaryFunc
-import os
+from pathlib import Path
+import hashlib
+import functools
 import logging
 logging.basicConfig(level=logging.WARNING)
+# Pipeline stages share data with their inputs instead of copying
+pd.set_option('mode.copy_on_write', True)
+
+# Keep-alive session for the Sahkotin API, retries transient gateway errors
+_session    = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=4, 
+    pool_maxsize=4, 
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])))
+
+# Pipeline results shared by all instances for the current hour
+_pipeline_cache:dict[tuple, pd.DataFrame] = {}
+
+def _hourly_cache(method):
+    """
+    Memoizes a SpotMedianCalculator pipeline stage. Results are keyed by 
+    stage, analysis settings, cache location and the current hour, so they 
+    expire when the hour changes. Empty results are not cached.
+
+    Args:
+        method: Pipeline method taking only self and returning a DataFrame
+
+    Returns:
+        Wrapped method returning a shallow copy of the cached DataFrame
+    """
+    @functools.wraps(method)
+    def wrapper(self) -> pd.DataFrame:
+        hour    = datetime.now().strftime('%Y-%m-%dT%H')
+        key     = (method.__name__, *self._cache_settings(), hour)
+        if key not in _pipeline_cache:
+            dataframe   = method(self)
+            if not isinstance(dataframe, pd.DataFrame) or dataframe.empty:
+                return dataframe
+            # Drop results of earlier hours before storing
+            for stale in [k for k in _pipeline_cache if k[-1] != hour]:
+                del _pipeline_cache[stale]
+            _pipeline_cache[key] = dataframe
+        return _pipeline_cache[key].copy(deep=False)
+    return wrapper
 
 class SpotMedianCalculator:
     """
@@ -22,13 +68,16 @@ class SpotMedianCalculator:
 
 
 # CLASS CONSTANTS ------------------------------------------------------------
+    # Date-time format tables are read-only, share them between instances
+    auxiliary_var   = AuxiliaryVar()
+
     def __init__(
                 self,
                 analysis_length         :int                = 5,
                 vat_perc                :float              = 0.255,
                 transfer_fee_perc       :float              = 0.111,
                 spot_cache_rel_dir      :str                = 'assets',
-                spot_cache_file         :str                = 'spot_price_data.csv',
+                spot_cache_file         :str                = 'spot_price_data',
                 ):
         f"""
         Initializes the SpotMedianCalculator with analysis configuration 
@@ -38,8 +87,10 @@ class SpotMedianCalculator:
             analysis_length (int): Number of years to include in analysis (max 13).
             vat_perc (float): VAT percentage as a decimal (e.g., 0.24).
             transfer_fee_perc (float): Transfer fee percentage as a decimal.
-            spot_cache_rel_dir (str): Relative directory for the cached CSV file.
-            spot_cache_file (str): Filename for the cached spot price data.
+            spot_cache_rel_dir (str): Relative directory for the spot price cache.
+            spot_cache_file (str): Name of the year-partitioned Parquet dataset 
+                directory holding the cached spot price data. A file suffix, 
+                as in the legacy 'spot_price_data.csv', is dropped.
         """
 
         
@@ -50,20 +101,59 @@ class SpotMedianCalculator:
         self.analysis_length        = analysis_length
         self.additional_fee         = (1 + vat_perc+transfer_fee_perc)
         self.spot_cache_rel_dir     = spot_cache_rel_dir
-        self.spot_cache_file        = spot_cache_file
-        self.auxiliary_var          = AuxiliaryVar()
-        self.auxiliary_func         = AuxiliaryFunc()
+        self._cache_path            = Path(spot_cache_rel_dir) / Path(spot_cache_file).with_suffix('')
+        self.spot_cache_file        = self._cache_path.name
 
         self.spot_price_median              = 'Spot median [c/kWh]'
         self.spot_price_median_fees         = 'Spot median w/ fees [c/kWh]'
 
+    @functools.cached_property
+    def auxiliary_func(self) -> AuxiliaryFunc:
+        """
+        Helper functions, created on first use since AuxiliaryFunc keeps a 
+        per-instance cache of parsed profiles.
+        """
+        return AuxiliaryFunc()
+
+    def _cache_settings(self) -> tuple:
+        """
+        Returns the settings that pipeline results depend on.
+        """
+        return (self.analysis_length, self.additional_fee, 
+                self.spot_cache_rel_dir, self.spot_cache_file)
+
+    def invalidate(self) -> None:
+        """
+        Drops cached pipeline results computed with this instance's settings, 
+        forcing the next call to reload the spot price data.
+        """
+        settings    = self._cache_settings()
+        for key in [k for k in _pipeline_cache if k[1:-1] == settings]:
+            del _pipeline_cache[key]
+        self._median_cache_path().unlink(missing_ok=True)
+
+    def _median_cache_path(self) -> Path:
+        """
+        Returns the path of the persisted spot_remove_years result. The 
+        filename hashes the settings the result depends on, so each settings 
+        combination keeps a single file next to the spot price cache. The 
+        month the result was computed for is stored inside the file.
+        """
+        settings    = f"{self.analysis_length}|{self.additional_fee:.6f}|{self.spot_cache_file}"
+        key         = hashlib.sha1(settings.encode()).hexdigest()[:16]
+        return self._cache_path.parent / f"median_cache_{key}.parquet"
+
 # SPOT PRICE PROCESSING FUNCTIONS ------------------------------------
+    @_hourly_cache
     def spot_get_price(self) -> pd.DataFrame:
         """
         Retrieves hourly Finnish spot electricity prices as a DataFrame.
 
-        Loads data from a cached CSV if available. If the cached data is missing or 
-        incomplete for the requested period, it updates the cache using the Sahkotin API.
+        Loads data from a cached Parquet dataset, partitioned by year, if 
+        available. A cache left as a single Parquet or CSV file is converted 
+        to the dataset on first use. If the cached data is missing years of the 
+        requested period, only those years are fetched from the Sahkotin API and 
+        added to the cache as new partitions.
 
         The resulting DataFrame is limited to the configured number of most recent 
         full years and indexed by hourly UTC timestamps.
@@ -74,28 +164,100 @@ class SpotMedianCalculator:
         """
 
 
-        def cached_csv_to_dataframe(filepath:str) -> pd.DataFrame:
+        def cached_dataset_to_dataframe(first_year:int, last_year:int) -> pd.DataFrame:
             """
-            Loads cached spot price data from a CSV file into a DataFrame.
+            Loads cached spot price data for a range of years from the Parquet 
+            dataset. Only the partitions of the requested years are read and 
+            the UTC timestamps come typed from the Parquet schema.
 
             Args:
-                filepath (str): Path to the CSV file.
+                first_year (int): First year to load.
+                last_year (int): Last year to load, inclusive.
 
             Returns:
                 pd.DataFrame: Time-indexed DataFrame containing:
                     - 'value' (float): Spot price in c/kWh.
             """
 
-            # Read CSV file as a Pandas DataFrame
-            dataframe           = pd.read_csv(filepath)
-            dataframe.columns = dataframe.columns.str.strip().str.lower()
-            # Set either 'date' or first column as datetime index
-            if 'date' in dataframe.columns:
-                dataframe['date']   = pd.to_datetime(dataframe['date'], utc=True)
-                dataframe.set_index('date', inplace=True)
-            else:
-                dataframe[0]   = pd.to_datetime(dataframe[0], utc=True)
-                dataframe.set_index(0, inplace=True)
+            dataset     = pa_dataset.dataset(cache_path, format='parquet', partitioning='hive')
+            year        = pa_dataset.field('year')
+            table       = dataset.to_table(
+                            columns=['date', 'value'], 
+                            filter=(year >= first_year) & (year <= last_year))
+            dataframe   = table.to_pandas().set_index('date')
+            # Fragments are not guaranteed to be read in year order
+            if not dataframe.index.is_monotonic_increasing:
+                dataframe   = dataframe.sort_index()
+            logging.info("Spot data Parquet dataset successfully loaded to dataframe")
+            return dataframe
+
+        def cached_years() -> list[int]:
+            """
+            Lists the years stored in the Parquet dataset from its partition 
+            directories, without reading any data.
+
+            Returns:
+                list[int]: Sorted cached years.
+            """
+
+            return sorted(int(path.name.split('=', 1)[1]) for path in cache_path.glob('year=*'))
+
+        def write_cache(dataframe:pd.DataFrame) -> None:
+            """
+            Writes spot price data to the Parquet dataset, one partition per 
+            year. Partitions of other years are left untouched, so adding years 
+            costs only the new data.
+
+            Args:
+                dataframe (pd.DataFrame): Time-indexed DataFrame with 'value' column.
+            """
+
+            table   = pa.Table.from_pandas(
+                        dataframe[['value']].reset_index().assign(year=dataframe.index.year), 
+                        preserve_index=False)
+            pa_dataset.write_dataset(
+                table, 
+                cache_path, 
+                format='parquet', 
+                partitioning=['year'], 
+                partitioning_flavor='hive', 
+                existing_data_behavior='overwrite_or_ignore', 
+                file_options=pa_dataset.ParquetFileFormat().make_write_options(compression='zstd'))
+
+        def legacy_parquet_to_dataframe(filepath:Path) -> pd.DataFrame:
+            """
+            Loads spot price data from a cache written as a single Parquet file.
+
+            Args:
+                filepath (Path): Path to the Parquet file.
+
+            Returns:
+                pd.DataFrame: Time-indexed DataFrame containing:
+                    - 'value' (float): Spot price in c/kWh.
+            """
+
+            dataframe   = pd.read_parquet(filepath, engine='pyarrow', columns=['value'])
+            logging.info("Spot data Parquet successfully loaded to dataframe")
+            return dataframe
+
+        def legacy_csv_to_dataframe(filepath:Path) -> pd.DataFrame:
+            """
+            Loads spot price data from a cache written in the legacy CSV format.
+
+            Args:
+                filepath (Path): Path to the CSV file.
+
+            Returns:
+                pd.DataFrame: Time-indexed DataFrame containing:
+                    - 'value' (float): Spot price in c/kWh.
+            """
+
+            # Known 'date','value' schema, Arrow parses the timestamps in C
+            dataframe   = pd.read_csv(
+                filepath, 
+                engine='pyarrow', 
+                dtype={'date': 'datetime64[ns, UTC]', 'value': 'float64'})
+            dataframe.set_index('date', inplace=True)
             logging.info("Spot data CSV successfully converted to dataframe")
             return dataframe
 
@@ -115,138 +277,186 @@ class SpotMedianCalculator:
 
             # Establish connection with API, raise for status if needed
             url             = f"https://sahkotin.fi/prices?start={start}&end={end}"
-            response        = requests.get(url)
+            response        = _session.get(url, timeout=(3.05, 30))
             response.raise_for_status()
             # Parse API response as JSON and extract values, price = snt/kWh
             spot            = response.json()
-            date_price_list = [
-                            {'date':entry['date'], 'value': entry['value'] * 0.1}
-                            for entries in spot.values()
-                            for entry in entries
-            ]
-            # Form datetime indexed Pandas DataFrame from parsed API response
-            dataframe   = pd.DataFrame(date_price_list)
-            dataframe['date']        = pd.to_datetime(dataframe['date'], utc=True)
-            dataframe.set_index('date', inplace=True)
+            entries         = [entry for entries in spot.values() for entry in entries]
+            dates           = pd.to_datetime(
+                                [entry['date'] for entry in entries], 
+                                format='ISO8601', 
+                                utc=True)
+            values          = np.fromiter(
+                                (entry['value'] for entry in entries), 
+                                dtype=np.float64, 
+                                count=len(entries))
+            # Form datetime indexed Pandas DataFrame from typed arrays
+            dataframe   = pd.DataFrame(
+                            {'value': values * 0.1}, 
+                            index=pd.DatetimeIndex(dates, name='date'))
             # Check if data in 15 minute resolution, convert to hourly
             dataframe   = self.auxiliary_func.resample_quarter_to_hour(dataframe)
             logging.info('Spot data got from API and converter to dataframe')
             return dataframe
+
+        def from_api_by_year(first_year:int, last_year:int) -> pd.DataFrame:
+            """
+            Fetches whole years of spot price data from the Sahkotin API, 
+            one request per year run in parallel.
+
+            Args:
+                first_year (int): First year to fetch.
+                last_year (int): Last year to fetch, inclusive.
+
+            Returns:
+                pd.DataFrame: Hourly time-indexed DataFrame with:
+                    - 'value' (float): Spot price in c/kWh.
+            """
+
+            windows     = [
+                        (f"{year}-01-01T00:00:00.000Z", f"{year}-12-31T23:00:00Z")
+                        for year in range(first_year, last_year+1)
+            ]
+            # Requests are I/O bound, each worker returns its own DataFrame
+            with ThreadPoolExecutor(max_workers=min(4, len(windows))) as executor:
+                frames  = list(executor.map(lambda window: from_api_to_dataframe(*window), windows))
+            return pd.concat(frames).sort_index()
         
-        def update_cache(dataframe:pd.DataFrame) -> pd.DataFrame:
+        def update_cache(years:list[int]) -> None:
             """
             Updates the cached spot price data by checking whether the stored 
-            date range covers the required analysis years.
+            years cover the required analysis years.
 
             If the cache is missing data from earlier or later years, it fetches 
-            and appends/prepends the missing data via API.
+            the missing years via API and writes them as new partitions.
 
             TODO: Improve granularity of cache update to include months, days, and hours.
 
             Args:
-                dataframe (pd.DataFrame): Existing DataFrame loaded from cache.
+                years (list[int]): Sorted years stored in the cache.
+            """
+
+            if years[-1] < end_year:
+                write_cache(from_api_by_year(years[-1]+1, end_year))
+                logging.info('Spot data cache updated from API')
+            elif years[0] > start_year:
+                write_cache(from_api_by_year(start_year, years[0]-1))
+                logging.info('Spot data cache updated from API')
+
+        def drop_partial_first_year(dataframe:pd.DataFrame) -> pd.DataFrame:
+            """
+            Removes the first year of the data if it does not cover all 12 months.
+
+            Args:
+                dataframe (pd.DataFrame): Time-indexed spot price DataFrame.
 
             Returns:
-                pd.DataFrame: Updated DataFrame with all required years included.
+                pd.DataFrame: DataFrame starting from the first full year.
             """
 
-            if dataframe.index.year.max() < end_year:
-                start       = f"{dataframe.index.year.max()+1}-01-01T00:00:00.000Z"
-                end         = f"{end_year}-12-31T23:00:00Z"
-                dataframe   = from_api_to_dataframe(start, end)
-                dataframe.to_csv(filepath, mode='a', header=not os.path.exists(filepath))
-                dataframe:pd.DataFrame = cached_csv_to_dataframe(filepath)
-                logging.info('Spot data CSV updated from API')
-                return dataframe
-            elif dataframe.index.year.min() > start_year:
-                start       = f"{start_year}-01-01T00:00:00.000Z"
-                end         = f"{dataframe.index.year.min()-1}-12-31T23:00:00Z"
-                new_df      = from_api_to_dataframe(start, end)
-                combined_df = pd.concat([new_df, dataframe], ignore_index=False)
-                combined_df.to_csv(filepath)
-                dataframe:pd.DataFrame = cached_csv_to_dataframe(filepath)
-                logging.info('Spot data CSV updated from API')
-                return dataframe
-            else:
+            years       = dataframe.index.year.values
+            months      = dataframe.index.month.values
+            if not len(years):
                 return dataframe
+            first_year  = years.min()
+            if np.unique(months[years == first_year]).size != 12:
+                dataframe   = dataframe.iloc[years != first_year]
+            return dataframe
 
 
         # Function variables
         end_year    = datetime.now().year-1
         start_year  = end_year-(self.analysis_length-1)
-        directory   = os.path.relpath(self.spot_cache_rel_dir)
-        filepath    = os.path.join(directory, self.spot_cache_file)
+        cache_path  = self._cache_path
+        legacy_paths    = {
+            cache_path.parent / f'{cache_path.name}.parquet':   legacy_parquet_to_dataframe,
+            cache_path.parent / f'{cache_path.name}.csv':       legacy_csv_to_dataframe,
+            }
 
         try:
-            # Check if requested data in cached data (CSV file) and read 
-            if os.path.exists(filepath):
-                dataframe:pd.DataFrame = cached_csv_to_dataframe(filepath)
+            years       = cached_years()
+            # Convert a cache left as a single Parquet or CSV file once
+            if not years:
+                for legacy_path, legacy_to_dataframe in legacy_paths.items():
+                    if legacy_path.is_file():
+                        write_cache(legacy_to_dataframe(legacy_path))
+                        years   = cached_years()
+                        logging.info(f'Spot data cache {legacy_path.name} converted to Parquet dataset')
+                        break
+            # Check if requested data in cached data (Parquet dataset) and read 
+            if years:
                 # Updates cached data if needed
-                dataframe   = update_cache(dataframe)
-                # Sets retrieved data to be used for specified analysis length
-                start       = f"{start_year}-01-01T00:00:00.000Z"
-                end         = f"{end_year}-12-31T23:00:00Z"
-                dataframe               = dataframe[start:end]
+                update_cache(years)
+                # Reads only the years used for specified analysis length
+                dataframe   = cached_dataset_to_dataframe(start_year, end_year)
                 # Removes first year if not full year (< 12 months)
-                first_year              = dataframe.index.year.min()
-                months_in_first_year    = dataframe.loc[dataframe.index.year == first_year].index.month.unique()
-                if len(months_in_first_year) != 12:
-                    dataframe   = dataframe[dataframe.index.year != dataframe.index.year.min()]
-                logging.info('Spot data got from CSV')
+                dataframe   = drop_partial_first_year(dataframe)
+                logging.info('Spot data got from cache')
                 return dataframe
-            elif not os.path.exists(filepath):
-                start       = f"{start_year}-01-01T00:00:00.000Z"
-                end         = f"{end_year}-12-31T23:00:00Z"
-                dataframe = from_api_to_dataframe(start, end)
-                os.mkdir(directory)
+            else:
+                dataframe = from_api_by_year(start_year, end_year)
+                cache_path.mkdir(parents=True, exist_ok=True)
                 logging.info('Spot price data cache directory made.')
-                dataframe.to_csv(filepath)
-                first_year              = dataframe.index.year.min()
-                months_in_first_year    = dataframe.loc[dataframe.index.year == first_year].index.month.unique()
-                if len(months_in_first_year) != 12:
-                    dataframe   = dataframe[dataframe.index.year != dataframe.index.year.min()]
-                logging.info('Spot data got from API and saved to CSV')
+                write_cache(dataframe)
+                dataframe   = drop_partial_first_year(dataframe)
+                logging.info('Spot data got from API and saved to cache')
                 return dataframe
-        except Exception as e:
-            logging.error(f"[spot_get_price]: {e}")
-            traceback.print_exc()
-            return pd.DataFrame
+        except (requests.RequestException, OSError, KeyError, ValueError) as e:
+            logging.exception(f"[spot_get_price]: {e}")
+            return pd.DataFrame()
 
+    @_hourly_cache
     def spot_pivot_by_hour(self) -> pd.DataFrame:
         """
         Reshapes spot price data by aligning hourly values across multiple years.
 
         Creates a pivot table where each row represents a specific calendar hour 
-        (e.g., "03-15 17:00:00"), and columns represent years. This enables 
+        (e.g., March 15th 17:00), and columns represent years. This enables 
         year-over-year hourly comparison.
 
         Returns:
             pd.DataFrame: Pivoted DataFrame with:
-                - Index: Hour key in "%m-%d %H:%M:%S" format.
-                - Columns: Years.
+                - Index: int32 hour key, month << 16 | day << 8 | hour.
+                - Columns: Years as int16.
                 - Values: Spot price in c/kWh.
         """
 
 
-        # Dictionary to group prices by "MM-DDTHH:MM:SS.000Z"
         try:
             # Define dataframe, check for content
             dataframe   = self.spot_get_price()
             if dataframe.empty:
                 logging.error('[spot_pivot_by_hour] Spot price DataFrame is empty')
-            # Create column for the hour key: "MM-DDTHH:MM:SS.000Z"
-            dataframe['hour_key']   = dataframe.index.strftime("%m-%d %H:%M:%S%z")
-            dataframe['year']       = dataframe.index.year
-            # Pivot the table: index = hour_key, columns = years, values = price
-            dataframe   = dataframe.pivot_table(index='hour_key', columns='year', values='value')
-            # Sort by year
-            dataframe   = dataframe.sort_index(axis=1)
-            return dataframe
-        except Exception as e:
-            logging.error(f"[spot_pivot_by_hour]: {e}")
-            traceback.print_exc()
-            return pd.DataFrame
-
+                return pd.DataFrame()
+            # Create integer hour key, sorts in calendar order like "MM-DD HH"
+            index       = dataframe.index
+            hour_key    = (
+                (index.month.values.astype(np.int32) << 16) 
+                | (index.day.values.astype(np.int32) << 8) 
+                | index.hour.values.astype(np.int32)
+                )
+            # Reshape: index = hour_key, columns = years, values = price
+            series      = (
+                dataframe
+                .assign(hour_key=hour_key, year=index.year)
+                .set_index(['hour_key', 'year'])['value']
+                )
+            if not series.index.is_unique:
+                # Average repeated hours as pivot_table did
+                series  = series.groupby(level=['hour_key', 'year']).mean()
+            # Sort by year, hour key fits in 32 bits and year in 16 bits
+            return (
+                series
+                .unstack('year')
+                .sort_index(axis=1)
+                .pipe(lambda pivot: pivot.set_axis(pivot.index.astype('int32'), axis=0))
+                .pipe(lambda pivot: pivot.set_axis(pivot.columns.astype('int16'), axis=1))
+                )
+        except (KeyError, ValueError) as e:
+            logging.exception(f"[spot_pivot_by_hour]: {e}")
+            return pd.DataFrame()
+
+    @_hourly_cache
     def spot_calculate_median(self) -> pd.DataFrame:
         """
         Calculates the median spot electricity price for each hour of the year 
@@ -266,14 +476,18 @@ class SpotMedianCalculator:
             dataframe   = self.spot_pivot_by_hour()
             if dataframe.empty:
                 logging.error('[spot_calculate_median] Spot price DataFrame is empty')
-            # Calculate median value for each row
-            dataframe[self.spot_price_median]       = dataframe.median(axis=1)
-            dataframe[self.spot_price_median_fees]  = (dataframe.median(axis=1) * self.additional_fee)
-            return dataframe
-        except Exception as e:
-            print(f"[spot_calculate_median] Unable to calculate: {e}")
-            return pd.DataFrame
+                return pd.DataFrame()
+            # Row-wise median skipping missing years, on the dense float block
+            median      = np.nanmedian(dataframe.to_numpy(dtype=np.float64, copy=False), axis=1)
+            return dataframe.assign(**{
+                self.spot_price_median:         median,
+                self.spot_price_median_fees:    median * self.additional_fee,
+                })
+        except (TypeError, ValueError) as e:
+            logging.exception(f"[spot_calculate_median]: {e}")
+            return pd.DataFrame()
     
+    @_hourly_cache
     def spot_remove_years(self) -> pd.DataFrame:
         """
         Converts the index of the aggregated median data to a single representative year (2024)
@@ -289,19 +503,48 @@ class SpotMedianCalculator:
         """
 
         try:
+            # Reuse result of an earlier run unless the spot cache has changed since
+            # and the analysis window has not moved to another month
+            median_path = self._median_cache_path()
+            period      = f"{datetime.now():%Y%m}"
+            if (median_path.is_file() and self._cache_path.is_dir() 
+                    and median_path.stat().st_mtime >= self._cache_path.stat().st_mtime):
+                try:
+                    cached  = pd.read_parquet(median_path, engine='pyarrow')
+                    if cached.attrs.get('period') == period:
+                        return cached
+                except (OSError, ValueError) as e:
+                    logging.warning(f"[spot_remove_years] Ignoring unreadable median cache: {e}")
             # Define dataframe, check for content
             dataframe   = self.spot_calculate_median()
             if dataframe.empty:
-                logging.error('[spot_calculate_median] Spot price DataFrame is empty')
-            # Add year to datetime index
-            dataframe['date']    = pd.to_datetime('2024-' + dataframe.index, utc=True)
-            dataframe.set_index('date', inplace=True)
+                logging.error('[spot_remove_years] Spot price DataFrame is empty')
+                return pd.DataFrame()
+            # Unpack the integer hour key into a 2024 timestamp: month start 
+            # plus day and hour offsets, without going through date parsing
+            hour_key    = dataframe.index.to_numpy()
+            month_start = np.arange('2024-01', '2025-01', dtype='datetime64[M]').astype('datetime64[h]')
+            timestamps  = (
+                month_start[((hour_key >> 16) & 0xFF) - 1]
+                + (((hour_key >> 8) & 0xFF) - 1).astype('timedelta64[D]')
+                + (hour_key & 0xFF).astype('timedelta64[h]')
+                )
+            index       = pd.DatetimeIndex(
+                            timestamps.astype('datetime64[ns]'), 
+                            name='date').tz_localize('UTC')
             # Remove all columns except median and median with fees
-            dataframe               = dataframe[[self.spot_price_median, 
-                                                 self.spot_price_median_fees]]
-            dataframe.columns.name  = None
+            dataframe   = (
+                dataframe[[self.spot_price_median, self.spot_price_median_fees]]
+                .set_axis(index, axis=0)
+                .rename_axis(columns=None)
+                )
+            # Overwrites the file of an earlier month for the same settings
+            dataframe.attrs['period'] = period
+            try:
+                dataframe.to_parquet(median_path, engine='pyarrow', compression='zstd')
+            except OSError as e:
+                logging.warning(f"[spot_remove_years] Median cache not written: {e}")
             return dataframe
-        except Exception as e:
-            print(f"[spot_remove_years] Error: {e}")
-            traceback.print_exc()
-            return pd.DataFrame
\ No newline at end of file
+        except (KeyError, ValueError) as e:
+            logging.exception(f"[spot_remove_years]: {e}")
+            return pd.DataFrame()
\ No newline at end of file
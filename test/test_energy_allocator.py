@@ -0,0 +1,226 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scr"))
+
+import spot_module
+from energy_allocator import EnergyAllocator
+
+PRODUCTION_PATH = os.path.join(ROOT, "test", "profile_production", "production.csv")
+COMPANY_PATH    = os.path.join(ROOT, "test", "profile_company", "company_consumption.csv")
+PROFILE_PATH    = os.path.join(ROOT, "test", "profiles_by_apartment", "A1_consumption.csv")
+SPOT_PATH       = os.path.join(ROOT, "assets", "spot_price_data.csv")
+
+# Rows of the apartment profile edited in the tests
+EDITED_ROWS     = slice(100, 111)
+
+
+class FixedDateTime(datetime):
+    """Pins the analysis period to the years covered by the shipped spot price csv."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 6, 1)
+
+
+class NextMonthDateTime(datetime):
+    """Moves the clock one month past FixedDateTime, within the same analysis years."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 7, 1)
+
+
+def read_spot_csv() -> pd.DataFrame:
+    prices          = pd.read_csv(SPOT_PATH, index_col="date")
+    prices.index    = pd.to_datetime(prices.index, utc=True)
+    return prices
+
+
+def fake_api_get(url:str, timeout=None) -> mock.Mock:
+    """Answers a Sahkotin API request from the shipped spot price csv, prices in EUR/MWh."""
+    query           = parse_qs(urlparse(url).query)
+    prices          = read_spot_csv().loc[query["start"][0]:query["end"][0], "value"]
+    response        = mock.Mock()
+    response.json.return_value = {"prices": [
+        {"date": f"{date:%Y-%m-%dT%H:%M:%S.000Z}", "value": value * 10} 
+        for date, value in prices.items()
+        ]}
+    return response
+
+
+class AllocatorTestCase(unittest.TestCase):
+    """Runs each test against a temporary spot price cache seeded from the shipped csv."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        shutil.copy(SPOT_PATH, self.tmp_dir)
+
+        patcher = mock.patch.object(spot_module, "datetime", FixedDateTime)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(spot_module._session, "get", side_effect=fake_api_get)
+        self.api_get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.profile = pd.read_csv(PROFILE_PATH, header=None)
+
+    def allocator(self, profile:pd.DataFrame, name:str, **kwargs) -> EnergyAllocator:
+        profile_path = os.path.join(self.tmp_dir, f"{name}_consumption.csv")
+        profile.to_csv(profile_path, header=False, index=False)
+        return EnergyAllocator(
+            PRODUCTION_PATH,
+            COMPANY_PATH,
+            app_data_dict       = {"apartment": ["A1"], "allocation": [1.0], "profile": [profile_path]},
+            spot_cache_rel_dir  = self.tmp_dir,
+            **kwargs,
+        )
+
+    def calculate(self, profile:pd.DataFrame, name:str) -> pd.DataFrame:
+        return self.allocator(profile, name).calculate_pv_over_production()
+
+
+class PvOverProductionTest(AllocatorTestCase):
+
+    def test_blank_profile_hours_count_as_zero(self):
+        blank           = self.profile.copy()
+        blank.iloc[EDITED_ROWS, 1] = np.nan
+        zero            = self.profile.copy()
+        zero.iloc[EDITED_ROWS, 1] = 0.0
+
+        blank_df        = self.calculate(blank, "blank")
+        zero_df         = self.calculate(zero, "zero")
+
+        # The apartment column keeps its blanks, the surplus treats them as no consumption
+        self.assertFalse(blank_df["PV over production [kWh]"].isna().any())
+        pd.testing.assert_series_equal(blank_df["PV over production [kWh]"], 
+                                       zero_df["PV over production [kWh]"])
+
+    def test_absent_profile_hours_stay_missing(self):
+        missing_hours   = pd.to_datetime(self.profile.iloc[EDITED_ROWS, 0])
+        absent          = self.profile.drop(self.profile.index[EDITED_ROWS])
+
+        absent_df       = self.calculate(absent, "absent")
+        nan_hours       = absent_df.index[absent_df["PV over production [kWh]"].isna()]
+
+        self.assertTrue(nan_hours.equals(pd.DatetimeIndex(missing_hours.to_numpy(), name=nan_hours.name)))
+
+
+
+class StageColumnsTest(AllocatorTestCase):
+
+    COMPANY_COLUMNS     = [
+        "Spot median [c/kWh]", "Spot median w/ fees [c/kWh]", "PV production [kWh]", 
+        "Company consumption [kWh]", "Company after PV [kWh]", 
+        "Company value of coverage [c]", "PV post company [kWh]",
+        ]
+
+    def test_stage_columns_do_not_depend_on_call_order(self):
+        allocator       = self.allocator(self.profile, "A1")
+        final_df        = allocator.calculate_pv_over_production()
+
+        self.assertEqual(len(final_df.columns), 12)
+        self.assertEqual(list(allocator.calculate_company().columns), self.COMPANY_COLUMNS)
+        self.assertEqual(list(allocator.add_apartment_consumption().columns), 
+                         self.COMPANY_COLUMNS + ["A1 consumption [kWh]"])
+        self.assertEqual(list(allocator.calculate_apartment().columns), 
+                         self.COMPANY_COLUMNS + ["A1 consumption [kWh]", "A1 after PV [kWh]", 
+                                                 "A1 value of coverage [c]"])
+
+
+class SpotCacheTest(AllocatorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(
+            spot_module.SpotMedianCalculator, "spot_calculate_median", autospec=True, 
+            side_effect=spot_module.SpotMedianCalculator.spot_calculate_median)
+        self.calculate_median = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def calculator(self, cache_dir:str = None) -> spot_module.SpotMedianCalculator:
+        return spot_module.SpotMedianCalculator(spot_cache_rel_dir=cache_dir or self.tmp_dir)
+
+    def remove_years(self) -> pd.DataFrame:
+        # Start from an empty in-memory cache, as a new run of the app would
+        spot_module._pipeline_cache.clear()
+        return self.calculator().spot_remove_years()
+
+    def median_files(self) -> list[str]:
+        return [name for name in os.listdir(self.tmp_dir) if name.startswith("median_cache_")]
+
+    def test_median_cache_reused_within_month(self):
+        first_df        = self.remove_years()
+        second_df       = self.remove_years()
+
+        self.assertEqual(self.calculate_median.call_count, 1)
+        pd.testing.assert_frame_equal(first_df, second_df)
+
+    def test_median_cache_recomputed_when_month_changes(self):
+        self.remove_years()
+        with mock.patch.object(spot_module, "datetime", NextMonthDateTime):
+            self.remove_years()
+
+        self.assertEqual(self.calculate_median.call_count, 2)
+        self.assertEqual(len(self.median_files()), 1)
+        median_path     = self.calculator()._median_cache_path()
+        self.assertEqual(pd.read_parquet(median_path).attrs["period"], "202507")
+
+    def test_median_cache_recomputed_after_new_partition(self):
+        self.remove_years()
+        median_path     = self.calculator()._median_cache_path()
+        # Age the median file so the check does not hinge on timestamp resolution
+        os.utime(median_path, (median_path.stat().st_atime - 60, median_path.stat().st_mtime - 60))
+        dataset_dir     = os.path.join(self.tmp_dir, "spot_price_data")
+        shutil.copytree(os.path.join(dataset_dir, "year=2020"), os.path.join(dataset_dir, "year=2019"))
+        self.remove_years()
+
+        self.assertEqual(self.calculate_median.call_count, 2)
+
+    def test_invalidate_removes_median_cache(self):
+        self.remove_years()
+        self.calculator().invalidate()
+
+        self.assertEqual(self.median_files(), [])
+
+    def test_single_file_cache_migrates_to_dataset(self):
+        expected        = read_spot_csv()
+        for suffix in (".parquet", ".csv"):
+            with self.subTest(suffix=suffix):
+                cache_dir   = os.path.join(self.tmp_dir, suffix.lstrip("."))
+                os.makedirs(cache_dir)
+                legacy_path = os.path.join(cache_dir, f"spot_price_data{suffix}")
+                if suffix == ".parquet":
+                    expected.to_parquet(legacy_path)
+                else:
+                    shutil.copy(SPOT_PATH, legacy_path)
+                prices      = self.calculator(cache_dir).spot_get_price()
+
+                partitions  = sorted(os.listdir(os.path.join(cache_dir, "spot_price_data")))
+                self.assertEqual(partitions, [f"year={year}" for year in range(2020, 2025)])
+                pd.testing.assert_series_equal(prices["value"], expected.loc["2020":"2024", "value"], 
+                                               check_freq=False)
+        self.api_get.assert_not_called()
+
+    def test_legacy_csv_cache_name_migrates_to_dataset(self):
+        legacy_df       = self.allocator(self.profile, "A1", spot_cache_file="spot_price_data.csv").calculate_pv_over_production()
+
+        self.assertFalse(legacy_df.empty)
+        self.assertTrue(os.path.isdir(os.path.join(self.tmp_dir, "spot_price_data", "year=2024")))
+        pd.testing.assert_frame_equal(legacy_df, self.calculate(self.profile, "A1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file